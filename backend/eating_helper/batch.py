@@ -0,0 +1,145 @@
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from pydantic import BaseModel
+
+from .meal_plan import WeeklyMealPlan
+from .recipes import Nutrition, Recipe, get_recipes_from_yaml
+from .secrets import MEAL_PLAN_YAML_FILE_PATH
+
+# Set in the parent before the pool is created. Forked workers inherit it
+# (along with the warm USDA food cache), so nothing is re-parsed or re-fetched.
+_recipes: List[Recipe] = []
+
+
+class MealPlanSummary(BaseModel):
+    name: str
+    days: int
+    nutrition: Nutrition
+    grocery_item_count: int
+    grocery_grams: float
+
+
+class MealPlanError(BaseModel):
+    path: str
+    error: str
+
+
+def compare():
+    if len(sys.argv) != 2:
+        print(f"Usage: {os.path.basename(sys.argv[0])} <meal plan directory>")
+        sys.exit(1)
+
+    summaries, errors = compare_meal_plans(sys.argv[1])
+    print_comparison_table(summaries)
+    for error in errors:
+        print(f"Skipped {error.path}: {error.error}", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
+
+def compare_meal_plans(
+    directory: str, processes: int | None = None
+) -> Tuple[List[MealPlanSummary], List[MealPlanError]]:
+    """
+    Evaluates every meal plan YAML file in the directory in parallel.
+    Recipes and USDA foods are loaded once, then shared with the workers.
+    A file that fails to load is reported instead of stopping the others.
+    """
+    global _recipes
+    _recipes = get_recipes_from_yaml()
+    for recipe in _recipes:
+        # Resolves (and caches) every USDA food the plans could use.
+        recipe.nutrition
+
+    yaml_file_paths = sorted(
+        os.path.join(directory, file_name)
+        for file_name in os.listdir(directory)
+        if file_name.endswith((".yaml", ".yml"))
+    )
+
+    context = multiprocessing.get_context("fork")
+    with context.Pool(processes=processes) as pool:
+        results = pool.map(_summarize_meal_plan, yaml_file_paths)
+
+    summaries = [result for result in results if isinstance(result, MealPlanSummary)]
+    errors = [result for result in results if isinstance(result, MealPlanError)]
+    return summaries, errors
+
+
+def _summarize_meal_plan(yaml_file_path: str) -> MealPlanSummary | MealPlanError:
+    try:
+        weekly_meal_plan = WeeklyMealPlan.from_yaml_and_recipes(
+            _recipes,
+            yaml_file_path=yaml_file_path,
+        )
+        grocery_items = weekly_meal_plan.grocery_items
+    except Exception as e:
+        # e.g. a KeyError for a recipe that does not exist.
+        return MealPlanError(path=yaml_file_path, error=f"{type(e).__name__}: {e}")
+
+    return MealPlanSummary(
+        name=os.path.splitext(os.path.basename(yaml_file_path))[0],
+        days=len(weekly_meal_plan.weekly_meals),
+        nutrition=weekly_meal_plan.nutrition,
+        grocery_item_count=len(grocery_items),
+        grocery_grams=sum(
+            item.ingredient.amount
+            for item in grocery_items
+            if item.ingredient.unit == "g"
+        ),
+    )
+
+
+def print_comparison_table(summaries: List[MealPlanSummary]) -> None:
+    headers = ["plan", "kcal/day", "protein", "carbs", "fat", "items", "grams"]
+    rows = []
+    for summary in summaries:
+        nutrition = summary.nutrition
+        days = summary.days or 1
+        rows.append(
+            [
+                summary.name,
+                str(round(nutrition.calories / days)),
+                str(round(nutrition.protein / days)),
+                str(round(nutrition.carbohydrates / days)),
+                str(round(nutrition.fat / days)),
+                str(summary.grocery_item_count),
+                str(round(summary.grocery_grams)),
+            ]
+        )
+
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    for row in [headers] + rows:
+        line = "  ".join(cell.ljust(width) for cell, width in zip(row, widths))
+        print(line.rstrip())
+
+
+# Benchmark. Compares copies of the current plan, as if trying out variations.
+def bench():
+    max_processes = os.cpu_count() or 1
+    process_counts = sorted(
+        {1, max_processes} | {n for n in [2, 4, 8] if n < max_processes}
+    )
+    print("plans  processes  total (s)  per plan (ms)")
+    for plan_count in [16, 64, 256]:
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(plan_count):
+                shutil.copy(
+                    MEAL_PLAN_YAML_FILE_PATH, os.path.join(directory, f"{i}.yaml")
+                )
+            for processes in process_counts:
+                start = time.perf_counter()
+                summaries, errors = compare_meal_plans(directory, processes)
+                elapsed = time.perf_counter() - start
+                if errors or len(summaries) != plan_count:
+                    raise Exception(f"Expected {plan_count} summaries, got {errors}")
+                print(
+                    f"{plan_count:<5}  {processes:<9}  {elapsed:<9.3f}  "
+                    f"{elapsed * 1000 / plan_count:.2f}"
+                )
@@ -7,6 +7,7 @@ from gcsa.calendar import AccessRoles
 from gcsa.event import Event
 from gcsa.google_calendar import GoogleCalendar
 from google.auth.exceptions import RefreshError
+from google.oauth2.credentials import Credentials
 from pydantic import BaseModel
 
 from ..secrets import GOOGLE_MEAL_PLAN_CALENDAR_NAME
@@ -25,8 +26,8 @@ def test():
     print(list(get_meal_plan_events()))
 
 
-def get_calendar_service() -> GoogleCalendar:
-    credentials = get_creds()
+def get_calendar_service(credentials: Credentials | None = None) -> GoogleCalendar:
+    credentials = credentials or get_creds()
     try:
         return GoogleCalendar(credentials=credentials)
     except RefreshError:
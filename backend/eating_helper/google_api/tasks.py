@@ -1,10 +1,11 @@
+from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
 from .auth import get_creds
 
 
-def get_google_tasks_service():
-    service = build("tasks", "v1", credentials=get_creds())
+def get_google_tasks_service(credentials: Credentials | None = None):
+    service = build("tasks", "v1", credentials=credentials or get_creds())
     return service
 
 
@@ -0,0 +1,337 @@
+import argparse
+import fcntl
+import os
+import random
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Iterator, List
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+from .meal_plan import WeeklyMealPlan, load_recipes_and_weekly_meal_plan
+
+HISTORY_DIR = os.path.abspath(
+    os.path.expanduser(
+        os.environ.get(
+            "EATING_HELPER_HISTORY_DIR",
+            "~/.local/share/eating_helper/history",
+        )
+    )
+)
+
+NUTRIENTS = ["calories", "protein", "carbohydrates", "fat"]
+
+# Plans run Saturday to Friday (day 0 is "Sat" on the dashboard, and `cal` is
+# run on Thursday to schedule it two days out), so weeks are keyed on the
+# Saturday they start.
+PLAN_START_WEEKDAY = 5
+
+# One directory per year with a Parquet file per table, e.g.
+# year=2023/grocery_items.parquet. Archiving a week rewrites its year, so a
+# query over years of history only opens a handful of files.
+_SCHEMAS = {
+    "daily_nutrition": pa.schema(
+        [("week", pa.date32()), ("day", pa.int8())]
+        + [(nutrient, pa.int32()) for nutrient in NUTRIENTS]
+    ),
+    "meals": pa.schema(
+        [
+            ("week", pa.date32()),
+            ("day", pa.int8()),
+            ("meal", pa.int8()),
+            ("recipe", pa.string()),
+        ]
+    ),
+    "grocery_items": pa.schema(
+        [
+            ("week", pa.date32()),
+            ("name", pa.string()),
+            ("amount", pa.float64()),
+            ("unit", pa.string()),
+            ("group", pa.string()),
+        ]
+    ),
+}
+
+
+class BoughtItem(BaseModel):
+    name: str
+    unit: str
+    amount: float
+    weeks: int
+
+
+def get_next_plan_start(day: date) -> date:
+    """
+    Returns the first Saturday on or after the day.
+    """
+    return day + timedelta(days=(PLAN_START_WEEKDAY - day.weekday()) % 7)
+
+
+def archive_weekly_meal_plan(
+    weekly_meal_plan: WeeklyMealPlan,
+    start: date,
+    history_dir: str = HISTORY_DIR,
+) -> None:
+    """
+    Saves the plan, daily nutrition and grocery items of the week starting on
+    `start`, which has to be a Saturday. Archiving a week again replaces it.
+    """
+    if start.weekday() != PLAN_START_WEEKDAY:
+        raise ValueError(f"Plans start on a Saturday, but {start} is a {start:%A}.")
+
+    columns: Dict[str, Dict[str, list]] = {
+        table: {name: [] for name in schema.names} for table, schema in _SCHEMAS.items()
+    }
+    for day, daily_meal_plan in enumerate(weekly_meal_plan.weekly_meals):
+        daily_nutrition = columns["daily_nutrition"]
+        daily_nutrition["day"].append(day)
+        for nutrient in NUTRIENTS:
+            daily_nutrition[nutrient].append(
+                getattr(daily_meal_plan.nutrition, nutrient)
+            )
+
+        for meal_index, meal in enumerate(daily_meal_plan.meals):
+            for recipe in meal.recipes:
+                columns["meals"]["day"].append(day)
+                columns["meals"]["meal"].append(meal_index)
+                columns["meals"]["recipe"].append(recipe.name)
+
+    for item in weekly_meal_plan.grocery_items:
+        grocery_items = columns["grocery_items"]
+        grocery_items["name"].append(item.ingredient.name)
+        grocery_items["amount"].append(item.ingredient.amount)
+        grocery_items["unit"].append(item.ingredient.unit)
+        grocery_items["group"].append(item.group.value)
+
+    tables = {}
+    for table, schema in _SCHEMAS.items():
+        table_columns = columns[table]
+        table_columns["week"] = [start] * len(table_columns[schema.names[1]])
+        tables[table] = pa.Table.from_pydict(table_columns, schema=schema)
+    _write_week(tables, start, history_dir)
+
+
+def _write_week(tables: Dict[str, pa.Table], start: date, history_dir: str) -> None:
+    """
+    Rewrites the week's year in a staging directory and then swaps it in, so
+    a failed archive never leaves half a week behind.
+    """
+    with _locked(history_dir):
+        year = f"year={start.year}"
+        year_dir = os.path.join(history_dir, year)
+        staging_dir = os.path.join(history_dir, f".staging-{year}")
+        os.makedirs(staging_dir)
+        try:
+            for table, week_table in tables.items():
+                path = os.path.join(year_dir, f"{table}.parquet")
+                if os.path.exists(path):
+                    other_weeks = pq.read_table(path, filters=[("week", "!=", start)])
+                    week_table = pa.concat_tables([other_weeks, week_table])
+                pq.write_table(
+                    week_table.sort_by("week"),
+                    os.path.join(staging_dir, f"{table}.parquet"),
+                )
+
+            old_dir = os.path.join(history_dir, f".old-{year}")
+            if os.path.exists(year_dir):
+                os.rename(year_dir, old_dir)
+            os.rename(staging_dir, year_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+@contextmanager
+def _locked(history_dir: str) -> Iterator[None]:
+    """
+    Holds the archive lock, first putting back a year whose swap was cut short.
+    """
+    os.makedirs(history_dir, exist_ok=True)
+    with open(os.path.join(history_dir, ".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            for name in os.listdir(history_dir):
+                path = os.path.join(history_dir, name)
+                if name.startswith(".staging-"):
+                    shutil.rmtree(path)
+                elif name.startswith(".old-"):
+                    year_dir = os.path.join(history_dir, name[len(".old-") :])
+                    if os.path.exists(year_dir):
+                        shutil.rmtree(path)
+                    else:
+                        os.rename(path, year_dir)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _scan(table: str, columns: List[str], since: date, history_dir: str) -> pa.Table:
+    schema = _SCHEMAS[table]
+    if not os.path.exists(history_dir):
+        return schema.empty_table().select(columns)
+
+    with _locked(history_dir):
+        # Weeks are filed under the year they start in, so older years are
+        # skipped without being opened.
+        paths = [
+            os.path.join(history_dir, name, f"{table}.parquet")
+            for name in sorted(os.listdir(history_dir))
+            if name.startswith("year=") and int(name[len("year=") :]) >= since.year
+        ]
+        if not paths:
+            return schema.empty_table().select(columns)
+
+        dataset = ds.dataset(paths, schema=schema, format="parquet")
+        return dataset.to_table(columns=columns, filter=ds.field("week") >= since)
+
+
+def average_daily_nutrition(
+    since: date, history_dir: str = HISTORY_DIR
+) -> Dict[str, float | None]:
+    table = _scan("daily_nutrition", NUTRIENTS, since, history_dir)
+    return {nutrient: pc.mean(table[nutrient]).as_py() for nutrient in NUTRIENTS}
+
+
+def most_bought_items(
+    since: date, limit: int = 10, history_dir: str = HISTORY_DIR
+) -> List[BoughtItem]:
+    """
+    Items bought in the most weeks, then by total amount.
+    """
+    table = _scan(
+        "grocery_items", ["name", "unit", "amount", "week"], since, history_dir
+    )
+    totals = (
+        table.group_by(["name", "unit"])
+        .aggregate([("amount", "sum"), ("week", "count_distinct")])
+        .sort_by([("week_count_distinct", "descending"), ("amount_sum", "descending")])
+        .slice(0, limit)
+    )
+    return [
+        BoughtItem(
+            name=row["name"],
+            unit=row["unit"],
+            amount=row["amount_sum"],
+            weeks=row["week_count_distinct"],
+        )
+        for row in totals.to_pylist()
+    ]
+
+
+def history():
+    parser = argparse.ArgumentParser(description="Archive and query past plans.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    archive_parser = subparsers.add_parser("archive", help="Archive the plan.")
+    archive_parser.add_argument(
+        "--start",
+        type=date.fromisoformat,
+        default=get_next_plan_start(date.today()),
+        help="Saturday the plan starts on (YYYY-MM-DD). Defaults to the next one.",
+    )
+
+    for command, help in [
+        ("nutrition", "Average daily nutrition."),
+        ("items", "Most bought grocery items."),
+    ]:
+        query_parser = subparsers.add_parser(command, help=help)
+        query_parser.add_argument("--months", type=int, default=6)
+        if command == "items":
+            query_parser.add_argument("--limit", type=int, default=10)
+
+    args = parser.parse_args()
+    if args.command == "archive":
+        _, weekly_meal_plan = load_recipes_and_weekly_meal_plan()
+        try:
+            archive_weekly_meal_plan(weekly_meal_plan, args.start)
+        except ValueError as e:
+            archive_parser.error(str(e))
+        print(f"Archived the week starting {args.start} to {HISTORY_DIR}")
+        return
+
+    since = date.today() - timedelta(days=30 * args.months)
+    if args.command == "nutrition":
+        for nutrient, average in average_daily_nutrition(since).items():
+            print(f"{nutrient}: {round(average, 2) if average is not None else '-'}")
+    else:
+        for item in most_bought_items(since, limit=args.limit):
+            print(
+                f"{item.weeks} weeks | {round(item.amount)} {item.unit} | {item.name}"
+            )
+
+
+# Benchmark. Archives years of synthetic weeks, then times the queries.
+def _bench_tables(start: date, rng: random.Random) -> Dict[str, pa.Table]:
+    days, meals = range(7), range(3)
+    items = rng.sample(range(150), 40)
+    columns = {
+        "daily_nutrition": {
+            "day": list(days),
+            **{
+                nutrient: [rng.randrange(50, 2500) for _ in days]
+                for nutrient in NUTRIENTS
+            },
+        },
+        "meals": {
+            "day": [day for day in days for _ in meals],
+            "meal": [meal for _ in days for meal in meals],
+            "recipe": [f"recipe {rng.randrange(60)}" for _ in days for _ in meals],
+        },
+        "grocery_items": {
+            "name": [f"item {item}" for item in items],
+            "amount": [float(rng.randrange(1, 1000)) for _ in items],
+            "unit": ["g" for _ in items],
+            "group": ["pantry" for _ in items],
+        },
+    }
+    tables = {}
+    for table, table_columns in columns.items():
+        rows = len(next(iter(table_columns.values())))
+        table_columns["week"] = [start] * rows
+        tables[table] = pa.Table.from_pydict(table_columns, schema=_SCHEMAS[table])
+    return tables
+
+
+def _bench_median(function, runs: int = 20) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def bench():
+    rng = random.Random(0)
+    last_start = get_next_plan_start(date.today())
+    print("weeks  archive (ms)  range     nutrition (ms)  items (ms)")
+    for weeks in [52, 300]:
+        with tempfile.TemporaryDirectory() as history_dir:
+            starts = [last_start - timedelta(weeks=i) for i in reversed(range(weeks))]
+            archive_start = time.perf_counter()
+            for start in starts:
+                _write_week(_bench_tables(start, rng), start, history_dir)
+            archive = (time.perf_counter() - archive_start) / weeks
+
+            for label, since in [
+                ("all", starts[0]),
+                ("6 months", last_start - timedelta(days=30 * 6)),
+            ]:
+                nutrition = _bench_median(
+                    lambda: average_daily_nutrition(since, history_dir=history_dir)
+                )
+                items = _bench_median(
+                    lambda: most_bought_items(since, history_dir=history_dir)
+                )
+                print(
+                    f"{weeks:<5}  {archive * 1000:<12.2f}  {label:<8}  "
+                    f"{nutrition * 1000:<14.2f}  {items * 1000:.2f}"
+                )
@@ -1,11 +1,16 @@
-from typing import Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
 
 import eating_helper.secrets as secrets
+from eating_helper.google_api.auth import get_creds
+from eating_helper.google_api.calendar import get_calendar_service
 from eating_helper.google_api.tasks import get_google_tasks_service
 
 from .food_group import FoodGroup
-from .meal_plan import WeeklyMealPlan
-from .recipes import Recipe, UntrackedIngredient, get_recipes_from_yaml
+from .meal_plan import GroceryItem, WeeklyMealPlan
+from .recipes import Recipe, get_recipes_from_yaml
 
 
 def grocery():
@@ -16,21 +21,23 @@ def create_grocery_list(is_dry_run=False):
     recipes: List[Recipe] = get_recipes_from_yaml()
     weekly_meal_plan = WeeklyMealPlan.from_yaml_and_recipes(recipes)
 
-    grocery_items = weekly_meal_plan.grocery_items
-    groups: Dict[FoodGroup, List[UntrackedIngredient]] = {}
-    for item in grocery_items:
-        if item.group not in groups:
-            groups[item.group] = []
-
-        groups[item.group].append(item)
-
     service = None
     if not is_dry_run:
         service = get_google_tasks_service()
 
+    upload_grocery_list(weekly_meal_plan, service, is_dry_run=is_dry_run)
+
+
+def upload_grocery_list(
+    weekly_meal_plan: WeeklyMealPlan,
+    service,
+    is_dry_run=False,
+    log: Callable[[str], None] = print,
+):
+    groups: Dict[FoodGroup, List[GroceryItem]] = weekly_meal_plan.grouped_grocery_items
     for group, grocery_items in groups.items():
         group = group.value.capitalize()
-        print(group)
+        log(group)
         if not is_dry_run:
             parent_task = (
                 service.tasks()
@@ -46,7 +53,7 @@ def create_grocery_list(is_dry_run=False):
             task_title = (
                 f"{round(item.ingredient.amount)} {item.ingredient.unit} | {name}"
             )
-            print(" " * 4, task_title)
+            log(f"{' ' * 4} {task_title}")
             if not is_dry_run:
                 service.tasks().insert(
                     tasklist=secrets.GOOGLE_TASKS_SHOPPING_LIST_ID,
@@ -59,3 +66,60 @@ def calendar():
     recipes: List[Recipe] = get_recipes_from_yaml()
     weekly_meal_plan = WeeklyMealPlan.from_yaml_and_recipes(recipes)
     weekly_meal_plan.create_calendar_events(2)
+
+
+def sync():
+    """
+    Builds the plan and Google services once, then uploads the grocery list
+    and creates the calendar events at the same time.
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+
+    with timed("plan", timings):
+        recipes: List[Recipe] = get_recipes_from_yaml()
+        weekly_meal_plan = WeeklyMealPlan.from_yaml_and_recipes(recipes)
+        # Resolve every food now so the two uploads only talk to Google.
+        weekly_meal_plan.grocery_items
+
+    with timed("auth", timings):
+        credentials = get_creds()
+        tasks_service = get_google_tasks_service(credentials)
+        calendar_service = get_calendar_service(credentials)
+
+    # Each upload gets its own service, since the Google clients are not
+    # thread-safe. The work is almost all waiting on HTTP, so threads suffice.
+    def upload_groceries():
+        with timed("groceries", timings):
+            upload_grocery_list(
+                weekly_meal_plan,
+                tasks_service,
+                log=lambda line: print(f"[groceries] {line}"),
+            )
+
+    def upload_calendar():
+        with timed("calendar", timings):
+            weekly_meal_plan.create_calendar_events(
+                2,
+                calendar_service=calendar_service,
+                log=lambda line: print(f"[calendar] {line}"),
+            )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(upload_groceries), executor.submit(upload_calendar)]
+        for future in futures:
+            future.result()
+
+    timings["total"] = time.perf_counter() - start
+    print()
+    for stage, seconds in timings.items():
+        print(f"{stage:<10} {seconds:.2f}s")
+
+
+@contextmanager
+def timed(stage: str, timings: Dict[str, float]) -> Iterator[None]:
+    print(f"[{stage}] started")
+    start = time.perf_counter()
+    yield
+    timings[stage] = time.perf_counter() - start
+    print(f"[{stage}] done in {timings[stage]:.2f}s")
@@ -1,8 +1,10 @@
+import os
 from functools import cached_property
-from typing import Dict, List
+from typing import Callable, Dict, List, Tuple
 
 import yaml
 from beautiful_date import BeautifulDate, D, days, hours
+from gcsa.google_calendar import GoogleCalendar
 from pydantic import BaseModel
 
 from .food_group import (
@@ -11,8 +13,8 @@ from .food_group import (
     FoodGroup,
 )
 from .google_api.calendar import add_event_to_meal_plan_calendar, get_calendar_service
-from .recipes import Nutrition, Recipe, UntrackedIngredient
-from .secrets import MEAL_PLAN_YAML_FILE_PATH
+from .recipes import Nutrition, Recipe, UntrackedIngredient, get_recipes_from_yaml
+from .secrets import MEAL_PLAN_YAML_FILE_PATH, RECIPES_YAML_FILE_PATH
 
 
 class GroceryItem(BaseModel):
@@ -23,12 +25,23 @@ class GroceryItem(BaseModel):
 class Meal(BaseModel):
     recipes: List[Recipe]
 
+    @cached_property
+    def nutrition(self) -> Nutrition:
+        meal_nutrition = Nutrition(calories=0, protein=0, carbohydrates=0, fat=0)
+        for recipe in self.recipes:
+            meal_nutrition += recipe.nutrition
+        return meal_nutrition
+
 
 class DailyMealPlan(BaseModel):
     meals: List[Meal]
 
-    def create_calendar_events(self, day: BeautifulDate, is_dry_run=False) -> None:
-        calendar_service = get_calendar_service()
+    def create_calendar_events(
+        self,
+        day: BeautifulDate,
+        calendar_service: GoogleCalendar,
+        is_dry_run=False,
+    ) -> None:
         for i, meal in enumerate(self.meals):
             meal_time = day + 3 * i * hours
             recipe_names = [recipe.name.title() for recipe in meal.recipes]
@@ -44,8 +57,7 @@ class DailyMealPlan(BaseModel):
     def nutrition(self) -> Nutrition:
         daily_nutrition = Nutrition(calories=0, protein=0, carbohydrates=0, fat=0)
         for meal in self.meals:
-            for recipe in meal.recipes:
-                daily_nutrition += recipe.nutrition
+            daily_nutrition += meal.nutrition
         return daily_nutrition
 
 
@@ -56,9 +68,13 @@ class WeeklyMealPlan(BaseModel):
         frozen = True
 
     @classmethod
-    def from_yaml_and_recipes(cls, recipes: List[Recipe]) -> "WeeklyMealPlan":
+    def from_yaml_and_recipes(
+        cls,
+        recipes: List[Recipe],
+        yaml_file_path: str = MEAL_PLAN_YAML_FILE_PATH,
+    ) -> "WeeklyMealPlan":
         yaml_data = None
-        with open(MEAL_PLAN_YAML_FILE_PATH, "r") as f:
+        with open(yaml_file_path, "r") as f:
             yaml_data = yaml.safe_load(f)
 
         name_to_recipe = {recipe.name: recipe for recipe in recipes}
@@ -166,8 +182,55 @@ class WeeklyMealPlan(BaseModel):
 
         return unique_grocery_items
 
-    def create_calendar_events(self, days_after: int, is_dry_run=False):
+    @cached_property
+    def grouped_grocery_items(self) -> Dict[FoodGroup, List[GroceryItem]]:
+        """
+        Returns the grocery items for the week, grouped by where I buy them.
+        """
+        groups: Dict[FoodGroup, List[GroceryItem]] = {}
+        for item in self.grocery_items:
+            if item.group not in groups:
+                groups[item.group] = []
+
+            groups[item.group].append(item)
+        return groups
+
+    def create_calendar_events(
+        self,
+        days_after: int,
+        is_dry_run=False,
+        calendar_service: GoogleCalendar | None = None,
+        log: Callable[[str], None] | None = None,
+    ):
+        calendar_service = calendar_service or get_calendar_service()
         start = D.today()[9:00] + days_after * days
         for daily_meal_plan in self.weekly_meals:
-            daily_meal_plan.create_calendar_events(start, is_dry_run=is_dry_run)
+            daily_meal_plan.create_calendar_events(
+                start,
+                calendar_service,
+                is_dry_run=is_dry_run,
+            )
+            if log:
+                log(f"{start.date()}: {len(daily_meal_plan.meals)} meals")
             start += 1 * days
+
+
+_loaded: Tuple[Tuple, List[Recipe], WeeklyMealPlan] | None = None
+
+
+def load_recipes_and_weekly_meal_plan() -> Tuple[List[Recipe], WeeklyMealPlan]:
+    """
+    Returns the recipes and weekly meal plan, only rebuilding them when one of
+    the YAML files changed. Each server worker checks the files on every call,
+    so editing a file invalidates the plan in all of them.
+    """
+    global _loaded
+    key = tuple(
+        (stat.st_mtime_ns, stat.st_size)
+        for stat in map(os.stat, [RECIPES_YAML_FILE_PATH, MEAL_PLAN_YAML_FILE_PATH])
+    )
+    if _loaded is None or _loaded[0] != key:
+        recipes = get_recipes_from_yaml()
+        weekly_meal_plan = WeeklyMealPlan.from_yaml_and_recipes(recipes)
+        _loaded = (key, recipes, weekly_meal_plan)
+    return _loaded[1], _loaded[2]
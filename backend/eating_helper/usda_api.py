@@ -1,20 +1,15 @@
-from functools import cached_property
-from typing import List
+from functools import cache, cached_property
+from typing import Dict, List
 
 import requests
-import requests_cache
 from pydantic import BaseModel
 
 from .secrets import USDA_API_KEY
+from .usda_cache import usda_cache
 
 USDA_URL = "https://api.nal.usda.gov/fdc/v1"
 USDA_API_MAX_CHUNK_SIZE = 20
 
-requests_cache.install_cache(
-    cache_name="usda_cache",
-    backend="sqlite",
-)
-
 
 class UsdaNutrient(BaseModel):
     name: str
@@ -64,30 +59,36 @@ class UsdaFood(BaseModel):
 
 
 def get_foods_by_id(fdc_ids: List[int]) -> List[UsdaFood]:
-    # "foods" endpoint only works with abridged for some reason.
-    # To get more details (like food category) you need to get food
-    # individually. So, use "food" endpoint (notice no s).
-    usda_foods = []
-    for fdc_id in fdc_ids:
-        url = f"{USDA_URL}/food/{fdc_id}?api_key={USDA_API_KEY}"
-        food = requests.get(url).json()
-        usda_nutrients = []
-        for nutrient in food["foodNutrients"]:
-            usda_nutrients.append(
-                UsdaNutrient(
-                    name=nutrient["nutrient"]["name"],
-                    amount=nutrient.get("amount"),
-                    unit=nutrient["nutrient"]["unitName"],
-                )
-            )
-
-        usda_foods.append(
-            UsdaFood(
-                fdc_id=fdc_id,
-                name=food["description"].capitalize(),
-                group=food.get("foodCategory", {}).get("description"),
-                nutrients=usda_nutrients,
+    return [get_food_by_id(fdc_id) for fdc_id in fdc_ids]
+
+
+@cache
+def get_food_by_id(fdc_id: int) -> UsdaFood:
+    food = usda_cache.get(fdc_id, fetch_food_json)
+    usda_nutrients = []
+    for nutrient in food["foodNutrients"]:
+        usda_nutrients.append(
+            UsdaNutrient(
+                name=nutrient["nutrient"]["name"],
+                amount=nutrient.get("amount"),
+                unit=nutrient["nutrient"]["unitName"],
             )
         )
 
-    return usda_foods
+    return UsdaFood(
+        fdc_id=fdc_id,
+        name=food["description"].capitalize(),
+        group=food.get("foodCategory", {}).get("description"),
+        nutrients=usda_nutrients,
+    )
+
+
+def fetch_food_json(fdc_id: int) -> Dict:
+    # "foods" endpoint only works with abridged for some reason.
+    # To get more details (like food category) you need to get food
+    # individually. So, use "food" endpoint (notice no s).
+    url = f"{USDA_URL}/food/{fdc_id}?api_key={USDA_API_KEY}"
+    response = requests.get(url)
+    # Do not let an error response end up in the cache.
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,137 @@
+import fcntl
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+# Absolute so every worker shares one file no matter where it was started from.
+USDA_CACHE_PATH = os.path.abspath(
+    os.path.expanduser(
+        os.environ.get(
+            "EATING_HELPER_USDA_CACHE_PATH",
+            "~/.cache/eating_helper/usda_cache.sqlite",
+        )
+    )
+)
+
+
+class UsdaCache:
+    """
+    USDA food JSON cache that is safe to share across processes.
+
+    SQLite runs in WAL mode so readers never block on a writer. Misses take a
+    per-FDC-id file lock, so only one process fetches a given food while the
+    others wait and then read the row it wrote.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_dir = f"{path}.locks"
+        self._local = threading.local()
+
+    def get(self, fdc_id: int, fetch: Callable[[int], Dict]) -> Dict:
+        data = self._read(fdc_id)
+        if data is not None:
+            return data
+
+        with self._single_flight(fdc_id):
+            # Another process may have fetched it while we waited on the lock.
+            data = self._read(fdc_id)
+            if data is None:
+                data = fetch(fdc_id)
+                self._write(fdc_id, data)
+        return data
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections cannot cross threads or forks, so keep one per both.
+        pid, connection = getattr(self._local, "connection", (None, None))
+        if pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS usda_foods "
+                "(fdc_id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+            )
+            connection.commit()
+            self._local.connection = (os.getpid(), connection)
+        return connection
+
+    def _read(self, fdc_id: int) -> Dict | None:
+        row = (
+            self._connection()
+            .execute("SELECT data FROM usda_foods WHERE fdc_id = ?", (fdc_id,))
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def _write(self, fdc_id: int, data: Dict) -> None:
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO usda_foods (fdc_id, data) VALUES (?, ?)",
+            (fdc_id, json.dumps(data)),
+        )
+        connection.commit()
+
+    @contextmanager
+    def _single_flight(self, fdc_id: int) -> Iterator[None]:
+        os.makedirs(self.lock_dir, exist_ok=True)
+        with open(os.path.join(self.lock_dir, f"{fdc_id}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+usda_cache = UsdaCache(USDA_CACHE_PATH)
+
+
+# Benchmark. Simulates N server workers cold-starting at once on the same ids.
+_BENCH_FETCH_SECONDS = 0.02
+_BENCH_FDC_IDS = list(range(100))
+_bench_cache: UsdaCache | None = None
+_bench_fetch_count = None
+
+
+def _bench_fetch(fdc_id: int) -> Dict:
+    with _bench_fetch_count.get_lock():
+        _bench_fetch_count.value += 1
+    time.sleep(_BENCH_FETCH_SECONDS)
+    return {"fdcId": fdc_id, "description": f"food {fdc_id}", "foodNutrients": []}
+
+
+def _bench_worker(seed: int) -> None:
+    fdc_ids = list(_BENCH_FDC_IDS)
+    random.Random(seed).shuffle(fdc_ids)
+    for fdc_id in fdc_ids:
+        _bench_cache.get(fdc_id, _bench_fetch)
+
+
+def bench():
+    global _bench_cache, _bench_fetch_count
+    context = multiprocessing.get_context("fork")
+    print("workers  cold (s)  fetches  warm (s)")
+    for workers in [1, 4, 16]:
+        with tempfile.TemporaryDirectory() as directory:
+            _bench_cache = UsdaCache(os.path.join(directory, "usda_cache.sqlite"))
+            _bench_fetch_count = context.Value("i", 0)
+            with context.Pool(processes=workers) as pool:
+                start = time.perf_counter()
+                pool.map(_bench_worker, range(workers))
+                cold = time.perf_counter() - start
+
+                start = time.perf_counter()
+                pool.map(_bench_worker, range(workers))
+                warm = time.perf_counter() - start
+            print(
+                f"{workers:<7}  {cold:<8.3f}  {_bench_fetch_count.value:<7}  "
+                f"{warm:.3f}"
+            )
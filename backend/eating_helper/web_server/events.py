@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Set
+
+
+class Broadcaster:
+    """
+    Fans out server-sent events to every subscriber.
+
+    Each event is encoded once and the same string is put on every
+    subscriber's bounded queue, so publishing never waits on a slow client.
+    A subscriber that falls too far behind is disconnected; EventSource
+    reconnects on its own and starts again from a fresh snapshot.
+    """
+
+    def __init__(self, max_queue_size: int = 16):
+        self.max_queue_size = max_queue_size
+        self._queues: Set[asyncio.Queue] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._queues)
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._queues.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._queues.discard(queue)
+
+    def publish(self, event: str, data: str) -> None:
+        message = encode_event(event, data)
+        for queue in list(self._queues):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._disconnect(queue)
+
+    def _disconnect(self, queue: asyncio.Queue) -> None:
+        self.unsubscribe(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def stream(
+        self, get_first_message: Callable[[], Awaitable[str]] | None = None
+    ) -> AsyncIterator[str]:
+        """
+        Yields messages until the subscriber is disconnected. The first message
+        is built only after subscribing, so nothing published while it is being
+        built can be missed.
+        """
+        queue = self.subscribe()
+        try:
+            if get_first_message is not None:
+                yield await get_first_message()
+            while True:
+                message = await queue.get()
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(queue)
+
+
+def encode_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+# Benchmark. Simulates many open dashboards receiving plan deltas.
+async def _bench_fan_out(subscribers: int, events: int) -> float:
+    broadcaster = Broadcaster(max_queue_size=events)
+    data = "x" * 2048
+    received = [0] * subscribers
+
+    async def consume(index: int) -> None:
+        async for _ in broadcaster.stream():
+            received[index] += 1
+            if received[index] == events:
+                return
+
+    tasks = [asyncio.create_task(consume(i)) for i in range(subscribers)]
+    # Let every consumer subscribe before publishing.
+    while broadcaster.subscriber_count < subscribers:
+        await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    for _ in range(events):
+        broadcaster.publish("plan", data)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    if sum(received) != subscribers * events:
+        raise Exception(
+            f"Expected {subscribers * events} messages, got {sum(received)}"
+        )
+    return elapsed
+
+
+def bench():
+    events = 100
+    print("subscribers  total (ms)  per event (ms)")
+    for subscribers in [1, 100, 500, 1000]:
+        elapsed = asyncio.run(_bench_fan_out(subscribers, events))
+        print(
+            f"{subscribers:<11}  {elapsed * 1000:<10.2f}  "
+            f"{elapsed * 1000 / events:.3f}"
+        )
@@ -1,15 +1,41 @@
-from typing import Dict, List
+import asyncio
+import logging
+from enum import Enum, unique
+from typing import Any, Dict, List
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from pydantic.json_schema import models_json_schema
 
-from ..meal_plan import Nutrition, WeeklyMealPlan
-from ..recipes import Recipe, get_recipes_from_yaml
+from ..food_group import FoodGroup
+from ..meal_plan import (
+    DailyMealPlan,
+    Nutrition,
+    WeeklyMealPlan,
+    load_recipes_and_weekly_meal_plan,
+)
+from ..recipes import Recipe, UntrackedIngredient
+from .events import Broadcaster, encode_event
+
+logger = logging.getLogger(__name__)
+
+# How often to check the YAML files for changes to push to subscribers.
+PLAN_POLL_SECONDS = 1.0
+
+# The dashboard subscribes to plan events from the browser.
+FRONTEND_ORIGIN = "http://localhost:3000"
 
 app = FastAPI(
     docs_url="/api/docs",
     openapi_url="/api/openapi.json",
 )
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=[FRONTEND_ORIGIN],
+    allow_methods=["GET"],
+)
 
 
 @app.get("/")
@@ -18,9 +44,8 @@ async def root() -> Dict:
 
 
 @app.get("/api/nutrition")
-async def get_weekly_nutrition() -> List[Nutrition]:
-    recipes: List[Recipe] = get_recipes_from_yaml()
-    weekly_meal_plan = WeeklyMealPlan.from_yaml_and_recipes(recipes)
+def get_weekly_nutrition() -> List[Nutrition]:
+    _, weekly_meal_plan = load_recipes_and_weekly_meal_plan()
     response = [daily_plan.nutrition for daily_plan in weekly_meal_plan.weekly_meals]
     return response
 
@@ -31,8 +56,8 @@ class GetRecipesResponse(BaseModel):
 
 
 @app.get("/api/recipes")
-async def get_recipes() -> List[GetRecipesResponse]:
-    recipes: List[Recipe] = get_recipes_from_yaml()
+def get_recipes() -> List[GetRecipesResponse]:
+    recipes, _ = load_recipes_and_weekly_meal_plan()
     response = []
     for recipe in recipes:
         response.append(
@@ -42,3 +67,236 @@ async def get_recipes() -> List[GetRecipesResponse]:
             )
         )
     return response
+
+
+@unique
+class PlanField(str, Enum):
+    """
+    Parts of the weekly plan that can be requested from /api/plan.
+    """
+
+    DAYS = "days"
+    RECIPES = "recipes"
+    TOTALS = "totals"
+    GROCERIES = "groceries"
+
+
+class MealResponse(BaseModel):
+    recipes: List[str]
+    nutrition: Nutrition
+
+
+class DayResponse(BaseModel):
+    meals: List[MealResponse]
+    nutrition: Nutrition
+
+
+def get_day_response(daily_plan: DailyMealPlan) -> DayResponse:
+    return DayResponse(
+        meals=[
+            MealResponse(
+                recipes=[recipe.name for recipe in meal.recipes],
+                nutrition=meal.nutrition,
+            )
+            for meal in daily_plan.meals
+        ],
+        nutrition=daily_plan.nutrition,
+    )
+
+
+class TotalsResponse(BaseModel):
+    daily: List[Nutrition]
+    weekly: Nutrition
+
+
+class GroceryGroupResponse(BaseModel):
+    group: FoodGroup
+    items: List[UntrackedIngredient]
+
+
+class GetPlanResponse(BaseModel):
+    """
+    Everything about the week's plan. Fields that were not requested are null.
+    """
+
+    days: List[DayResponse] | None = None
+    recipes: List[GetRecipesResponse] | None = None
+    totals: TotalsResponse | None = None
+    groceries: List[GroceryGroupResponse] | None = None
+
+
+@app.get("/api/plan")
+def get_plan(
+    fields: List[PlanField] = Query(default=list(PlanField)),
+) -> GetPlanResponse:
+    recipes, weekly_meal_plan = load_recipes_and_weekly_meal_plan()
+
+    # Only compute what was asked for. Nutrition and grocery items are cached
+    # on the plan, so parts that overlap (e.g. days and totals) are computed once.
+    response = GetPlanResponse()
+    if PlanField.DAYS in fields:
+        response.days = [
+            get_day_response(daily_plan) for daily_plan in weekly_meal_plan.weekly_meals
+        ]
+
+    if PlanField.RECIPES in fields:
+        response.recipes = [
+            GetRecipesResponse(name=recipe.name, nutrition=recipe.nutrition)
+            for recipe in recipes
+        ]
+
+    if PlanField.TOTALS in fields:
+        response.totals = TotalsResponse(
+            daily=[
+                daily_plan.nutrition for daily_plan in weekly_meal_plan.weekly_meals
+            ],
+            weekly=weekly_meal_plan.nutrition,
+        )
+
+    if PlanField.GROCERIES in fields:
+        response.groceries = [
+            GroceryGroupResponse(
+                group=group,
+                items=[item.ingredient for item in items],
+            )
+            for group, items in weekly_meal_plan.grouped_grocery_items.items()
+        ]
+
+    return response
+
+
+class PlanSnapshot(BaseModel):
+    days: List[DayResponse]
+    recipes: Dict[str, Nutrition]
+
+
+class PlanDelta(BaseModel):
+    """
+    Changes since the previous plan event. Days are keyed by index; day_count
+    tells the client to drop any days past the end of the week.
+    """
+
+    day_count: int
+    days: Dict[int, DayResponse]
+    recipes: List[GetRecipesResponse]
+    removed_recipes: List[str]
+
+
+def get_plan_snapshot(
+    recipes: List[Recipe], weekly_meal_plan: WeeklyMealPlan
+) -> PlanSnapshot:
+    return PlanSnapshot(
+        days=[
+            get_day_response(daily_plan) for daily_plan in weekly_meal_plan.weekly_meals
+        ],
+        recipes={recipe.name: recipe.nutrition for recipe in recipes},
+    )
+
+
+def get_plan_delta(old: PlanSnapshot | None, new: PlanSnapshot) -> PlanDelta:
+    old_days = old.days if old else []
+    old_recipes = old.recipes if old else {}
+    return PlanDelta(
+        day_count=len(new.days),
+        days={
+            i: day
+            for i, day in enumerate(new.days)
+            if i >= len(old_days) or old_days[i] != day
+        },
+        recipes=[
+            GetRecipesResponse(name=name, nutrition=nutrition)
+            for name, nutrition in new.recipes.items()
+            if old_recipes.get(name) != nutrition
+        ],
+        removed_recipes=[name for name in old_recipes if name not in new.recipes],
+    )
+
+
+plan_broadcaster = Broadcaster()
+plan_snapshot: PlanSnapshot | None = None
+plan_snapshot_source: WeeklyMealPlan | None = None
+plan_snapshot_lock = asyncio.Lock()
+plan_watcher: asyncio.Task | None = None
+
+
+async def refresh_plan_snapshot() -> None:
+    """
+    Rebuilds the snapshot and publishes the delta, but only when a YAML file
+    changed, i.e. when the loader handed back a different plan.
+    """
+    global plan_snapshot, plan_snapshot_source
+    async with plan_snapshot_lock:
+        recipes, weekly_meal_plan = await asyncio.to_thread(
+            load_recipes_and_weekly_meal_plan
+        )
+        if weekly_meal_plan is plan_snapshot_source:
+            return
+
+        snapshot = await asyncio.to_thread(get_plan_snapshot, recipes, weekly_meal_plan)
+        if plan_snapshot is not None and snapshot != plan_snapshot:
+            delta = get_plan_delta(plan_snapshot, snapshot)
+            plan_broadcaster.publish("plan", delta.model_dump_json())
+        plan_snapshot = snapshot
+        plan_snapshot_source = weekly_meal_plan
+
+
+async def watch_plan() -> None:
+    while True:
+        try:
+            await refresh_plan_snapshot()
+        except Exception:
+            # A half-saved YAML file should not kill the watcher.
+            logger.exception("Failed to reload the meal plan.")
+        await asyncio.sleep(PLAN_POLL_SECONDS)
+
+
+@app.on_event("startup")
+async def start_watching_plan() -> None:
+    # Keep a reference; the event loop only holds tasks weakly.
+    global plan_watcher
+    plan_watcher = asyncio.create_task(watch_plan())
+
+
+@app.on_event("shutdown")
+async def stop_watching_plan() -> None:
+    if plan_watcher:
+        plan_watcher.cancel()
+
+
+async def get_first_plan_event() -> str:
+    if plan_snapshot is None:
+        await refresh_plan_snapshot()
+    return encode_event("plan", get_plan_delta(None, plan_snapshot).model_dump_json())
+
+
+# Left out of the schema: the generated client cannot consume a stream, so the
+# dashboard opens it with EventSource and parses each event as a PlanDelta.
+@app.get("/api/plan/events", include_in_schema=False)
+async def get_plan_events() -> StreamingResponse:
+    """
+    Server-sent events. The first event holds the whole plan, later events
+    only the days and recipes that changed.
+    """
+    return StreamingResponse(
+        plan_broadcaster.stream(get_first_plan_event),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+def openapi() -> Dict[str, Any]:
+    """
+    Adds PlanDelta to the schema even though no route returns it, so the
+    generated client still has a type for plan events.
+    """
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        _, definitions = models_json_schema(
+            [(PlanDelta, "validation")],
+            ref_template="#/components/schemas/{model}",
+        )
+        schema["components"]["schemas"].update(definitions["$defs"])
+    return app.openapi_schema
+
+
+app.openapi = openapi
@@ -0,0 +1,77 @@
+import importlib.util
+import sys
+import types
+
+import pytest
+import yaml
+
+# secrets.py is not checked in. The tests never call Google or USDA, so
+# placeholders are enough to import the package without one.
+if importlib.util.find_spec("eating_helper.secrets") is None:
+    secrets = types.ModuleType("eating_helper.secrets")
+    secrets.USDA_API_KEY = ""
+    secrets.RECIPES_YAML_FILE_PATH = ""
+    secrets.MEAL_PLAN_YAML_FILE_PATH = ""
+    secrets.GOOGLE_API_CREDENTIALS_FILE_PATH = ""
+    secrets.GOOGLE_MEAL_PLAN_CALENDAR_NAME = ""
+    secrets.GOOGLE_TASKS_SHOPPING_LIST_ID = ""
+    sys.modules["eating_helper.secrets"] = secrets
+
+from eating_helper import recipes, usda_api  # noqa: E402
+from eating_helper.usda_cache import UsdaCache  # noqa: E402
+
+# Per 100g: calories, protein, carbohydrates, fat.
+USDA_FOODS = {
+    1001: ("Rolled oats", "Cereal Grains and Pasta", (400, 10, 60, 10)),
+    1002: ("Milk", "Dairy and Egg Products", (50, 3, 5, 2)),
+    1003: ("Chicken breast", "Poultry Products", (150, 30, 0, 3)),
+}
+
+RECIPES = {
+    # 500 kcal, 16g protein, 70g carbohydrates, 14g fat.
+    "oats": {"ingredients": {"main": {1001: 100, 1002: 200}, "for_taste": None}},
+    # 300 kcal, 60g protein, 0g carbohydrates, 6g fat.
+    "chicken": {"ingredients": {"main": {1003: 200}, "for_taste": {"salt": "1 g"}}},
+}
+
+
+def usda_food_json(fdc_id: int) -> dict:
+    description, category, amounts = USDA_FOODS[fdc_id]
+    names = [
+        ("Energy", "kcal"),
+        ("Protein", "g"),
+        ("Carbohydrate, by difference", "g"),
+        ("Total lipid (fat)", "g"),
+    ]
+    return {
+        "fdcId": fdc_id,
+        "description": description,
+        "foodCategory": {"description": category},
+        "foodNutrients": [
+            {"nutrient": {"name": name, "unitName": unit}, "amount": amount}
+            for (name, unit), amount in zip(names, amounts)
+        ],
+    }
+
+
+def write_yaml(path, data) -> str:
+    with open(path, "w") as f:
+        yaml.safe_dump(data, f)
+    return str(path)
+
+
+@pytest.fixture
+def recipes_yaml(tmp_path, monkeypatch) -> str:
+    """
+    Writes the test recipes and serves their USDA foods from a local cache.
+    """
+    cache = UsdaCache(str(tmp_path / "usda_cache.sqlite"))
+    for fdc_id in USDA_FOODS:
+        cache.get(fdc_id, usda_food_json)
+
+    path = write_yaml(tmp_path / "recipes.yaml", RECIPES)
+    monkeypatch.setattr(recipes, "RECIPES_YAML_FILE_PATH", path)
+    monkeypatch.setattr(usda_api, "usda_cache", cache)
+    usda_api.get_food_by_id.cache_clear()
+    yield path
+    usda_api.get_food_by_id.cache_clear()
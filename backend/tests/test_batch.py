@@ -0,0 +1,39 @@
+from conftest import write_yaml
+
+from eating_helper.batch import compare_meal_plans, print_comparison_table
+
+
+def test_compare_meal_plans(recipes_yaml, tmp_path, capsys):
+    directory = tmp_path / "plans"
+    directory.mkdir()
+    write_yaml(
+        directory / "short.yaml",
+        {"sat": {"breakfast": ["oats"]}, "sun": {"breakfast": ["oats", "chicken"]}},
+    )
+    write_yaml(
+        directory / "week.yaml",
+        {day: {"breakfast": ["oats"]} for day in ["sat", "sun", "mon", "tue"]},
+    )
+    write_yaml(directory / "typo.yaml", {"sat": {"breakfast": ["oatz"]}})
+    (directory / "notes.txt").write_text("not a plan")
+
+    summaries, errors = compare_meal_plans(str(directory), processes=2)
+
+    assert [summary.name for summary in summaries] == ["short", "week"]
+    short, week = summaries
+    assert short.days == 2
+    assert short.nutrition.calories == 1300
+    assert short.grocery_item_count == 4
+    assert short.grocery_grams == 200 + 400 + 200 + 1
+    assert week.days == 4
+    assert week.nutrition.calories == 2000
+
+    assert len(errors) == 1
+    assert errors[0].path == str(directory / "typo.yaml")
+    assert "oatz" in errors[0].error
+
+    print_comparison_table(summaries)
+    rows = capsys.readouterr().out.splitlines()
+    # Per day averages use each plan's own day count.
+    assert rows[1].split()[:2] == ["short", "650"]
+    assert rows[2].split()[:2] == ["week", "500"]
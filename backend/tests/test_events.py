@@ -0,0 +1,83 @@
+import asyncio
+
+from eating_helper.web_server.events import Broadcaster, encode_event
+
+
+async def consume(broadcaster: Broadcaster, count: int, **kwargs) -> list:
+    messages = []
+    async for message in broadcaster.stream(**kwargs):
+        messages.append(message)
+        if len(messages) == count:
+            break
+    return messages
+
+
+async def wait_for_subscribers(broadcaster: Broadcaster, count: int) -> None:
+    while broadcaster.subscriber_count < count:
+        await asyncio.sleep(0)
+
+
+def test_every_subscriber_gets_every_event():
+    subscribers = 500
+    events = [encode_event("plan", str(i)) for i in range(10)]
+
+    async def run():
+        broadcaster = Broadcaster(max_queue_size=len(events))
+        tasks = [
+            asyncio.create_task(consume(broadcaster, len(events)))
+            for _ in range(subscribers)
+        ]
+        await wait_for_subscribers(broadcaster, subscribers)
+        for i in range(len(events)):
+            broadcaster.publish("plan", str(i))
+        results = await asyncio.gather(*tasks)
+        return broadcaster, results
+
+    broadcaster, results = asyncio.run(run())
+    assert len(results) == subscribers
+    assert all(messages == events for messages in results)
+    assert broadcaster.subscriber_count == 0
+
+
+def test_events_published_while_building_first_message_are_kept():
+    async def run():
+        broadcaster = Broadcaster()
+
+        async def get_first_message():
+            # The watcher publishes while the snapshot is still being built.
+            broadcaster.publish("plan", "delta-1")
+            return encode_event("plan", "snapshot")
+
+        task = asyncio.create_task(
+            consume(broadcaster, 3, get_first_message=get_first_message)
+        )
+        await wait_for_subscribers(broadcaster, 1)
+        await asyncio.sleep(0)
+        broadcaster.publish("plan", "delta-2")
+        return await task
+
+    assert asyncio.run(run()) == [
+        encode_event("plan", "snapshot"),
+        encode_event("plan", "delta-1"),
+        encode_event("plan", "delta-2"),
+    ]
+
+
+def test_slow_subscriber_is_disconnected():
+    async def run():
+        broadcaster = Broadcaster(max_queue_size=2)
+        stream = broadcaster.stream()
+        # Subscribe, then never read while events pile up.
+        first = asyncio.create_task(stream.__anext__())
+        await wait_for_subscribers(broadcaster, 1)
+        for i in range(3):
+            broadcaster.publish("plan", str(i))
+        assert broadcaster.subscriber_count == 0
+        # The stream ends instead of delivering a partial history.
+        try:
+            await first
+        except StopAsyncIteration:
+            return True
+        return False
+
+    assert asyncio.run(run())
@@ -0,0 +1,134 @@
+import os
+from datetime import date
+
+import pytest
+from conftest import write_yaml
+
+from eating_helper import history
+from eating_helper.history import (
+    archive_weekly_meal_plan,
+    average_daily_nutrition,
+    get_next_plan_start,
+    most_bought_items,
+)
+from eating_helper.meal_plan import WeeklyMealPlan
+from eating_helper.recipes import get_recipes_from_yaml
+
+SATURDAY = date(2023, 12, 23)
+
+
+@pytest.fixture
+def load_plan(recipes_yaml, tmp_path):
+    recipes = get_recipes_from_yaml()
+
+    def load(plan: dict) -> WeeklyMealPlan:
+        path = write_yaml(tmp_path / "weekly_meal_plan.yaml", plan)
+        return WeeklyMealPlan.from_yaml_and_recipes(recipes, yaml_file_path=path)
+
+    return load
+
+
+@pytest.fixture
+def history_dir(tmp_path) -> str:
+    return str(tmp_path / "history")
+
+
+def test_get_next_plan_start():
+    assert get_next_plan_start(date(2023, 12, 21)) == SATURDAY
+    assert get_next_plan_start(SATURDAY) == SATURDAY
+    assert get_next_plan_start(date(2023, 12, 24)) == date(2023, 12, 30)
+
+
+def test_archive_rejects_weeks_not_starting_on_saturday(load_plan, history_dir):
+    weekly_meal_plan = load_plan({"sat": {"breakfast": ["oats"]}})
+    with pytest.raises(ValueError, match="2023-12-25 is a Monday"):
+        archive_weekly_meal_plan(weekly_meal_plan, date(2023, 12, 25), history_dir)
+    assert not os.path.exists(history_dir)
+
+
+def test_empty_archive(history_dir):
+    assert average_daily_nutrition(SATURDAY, history_dir=history_dir) == {
+        "calories": None,
+        "protein": None,
+        "carbohydrates": None,
+        "fat": None,
+    }
+    assert most_bought_items(SATURDAY, history_dir=history_dir) == []
+
+    os.makedirs(history_dir)
+    assert most_bought_items(SATURDAY, history_dir=history_dir) == []
+
+
+def test_archiving_a_week_again_replaces_it(load_plan, history_dir):
+    first = load_plan({"sat": {"breakfast": ["oats"]}, "sun": {"lunch": ["chicken"]}})
+    archive_weekly_meal_plan(first, SATURDAY, history_dir)
+    assert average_daily_nutrition(SATURDAY, history_dir)["calories"] == 400
+
+    second = load_plan({"sat": {"breakfast": ["oats", "chicken"]}})
+    archive_weekly_meal_plan(second, SATURDAY, history_dir)
+    assert average_daily_nutrition(SATURDAY, history_dir)["calories"] == 800
+    items = most_bought_items(SATURDAY, history_dir=history_dir)
+    assert {item.name: item.weeks for item in items} == {
+        "Rolled oats": 1,
+        "Milk": 1,
+        "Chicken breast": 1,
+        "salt": 1,
+    }
+
+
+def test_aggregations_across_years(load_plan, history_dir):
+    oats = load_plan({"sat": {"breakfast": ["oats"]}})
+    chicken = load_plan({"sat": {"breakfast": ["chicken"]}})
+    archive_weekly_meal_plan(oats, date(2023, 12, 23), history_dir)
+    archive_weekly_meal_plan(chicken, date(2023, 12, 30), history_dir)
+    archive_weekly_meal_plan(oats, date(2024, 1, 6), history_dir)
+    assert sorted(os.listdir(history_dir)) == [".lock", "year=2023", "year=2024"]
+
+    assert average_daily_nutrition(date(2023, 1, 1), history_dir) == {
+        "calories": pytest.approx(1300 / 3),
+        "protein": pytest.approx(92 / 3),
+        "carbohydrates": pytest.approx(140 / 3),
+        "fat": pytest.approx(34 / 3),
+    }
+    assert average_daily_nutrition(date(2023, 12, 30), history_dir)["calories"] == 400
+
+    items = most_bought_items(date(2023, 1, 1), limit=2, history_dir=history_dir)
+    assert [(item.name, item.amount, item.weeks) for item in items] == [
+        ("Milk", 400, 2),
+        ("Rolled oats", 200, 2),
+    ]
+
+
+def test_failed_archive_keeps_the_previous_year(load_plan, history_dir, monkeypatch):
+    oats = load_plan({"sat": {"breakfast": ["oats"]}})
+    archive_weekly_meal_plan(oats, SATURDAY, history_dir)
+
+    write_table = history.pq.write_table
+
+    def fail_on_grocery_items(table, path, **kwargs):
+        if path.endswith("grocery_items.parquet"):
+            raise OSError("disk full")
+        write_table(table, path, **kwargs)
+
+    monkeypatch.setattr(history.pq, "write_table", fail_on_grocery_items)
+    chicken = load_plan({"sat": {"breakfast": ["chicken"]}})
+    with pytest.raises(OSError, match="disk full"):
+        archive_weekly_meal_plan(chicken, SATURDAY, history_dir)
+
+    assert sorted(os.listdir(history_dir)) == [".lock", "year=2023"]
+    assert average_daily_nutrition(SATURDAY, history_dir)["calories"] == 500
+
+
+def test_interrupted_swap_is_recovered(load_plan, history_dir):
+    oats = load_plan({"sat": {"breakfast": ["oats"]}})
+    archive_weekly_meal_plan(oats, SATURDAY, history_dir)
+    # As if the archive died between moving the old year aside and moving the
+    # new one in.
+    os.rename(
+        os.path.join(history_dir, "year=2023"),
+        os.path.join(history_dir, ".old-year=2023"),
+    )
+    os.makedirs(os.path.join(history_dir, ".staging-year=2023"))
+
+    assert average_daily_nutrition(SATURDAY, history_dir)["calories"] == 500
+    assert sorted(os.listdir(history_dir)) == [".lock", "year=2023"]
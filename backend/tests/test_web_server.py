@@ -0,0 +1,11 @@
+from eating_helper.web_server.main import app
+
+
+def test_openapi_has_plan_delta_but_not_the_event_stream():
+    schema = app.openapi()
+    assert "/api/plan/events" not in schema["paths"]
+    plan_delta = schema["components"]["schemas"]["PlanDelta"]
+    assert plan_delta["properties"]["days"]["additionalProperties"] == {
+        "$ref": "#/components/schemas/DayResponse"
+    }
+    assert "DayResponse" in schema["components"]["schemas"]
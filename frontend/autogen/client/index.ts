@@ -7,7 +7,18 @@ export { CancelablePromise, CancelError } from "./core/CancelablePromise"
 export { OpenAPI } from "./core/OpenAPI"
 export type { OpenAPIConfig } from "./core/OpenAPI"
 
+export type { DayResponse } from "./models/DayResponse"
+export { FoodGroup } from "./models/FoodGroup"
+export type { GetPlanResponse } from "./models/GetPlanResponse"
 export type { GetRecipesResponse } from "./models/GetRecipesResponse"
+export type { GroceryGroupResponse } from "./models/GroceryGroupResponse"
+export type { HTTPValidationError } from "./models/HTTPValidationError"
+export type { MealResponse } from "./models/MealResponse"
 export type { Nutrition } from "./models/Nutrition"
+export type { PlanDelta } from "./models/PlanDelta"
+export { PlanField } from "./models/PlanField"
+export type { TotalsResponse } from "./models/TotalsResponse"
+export type { UntrackedIngredient } from "./models/UntrackedIngredient"
+export type { ValidationError } from "./models/ValidationError"
 
 export { DefaultService } from "./services/DefaultService"
@@ -0,0 +1,12 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { MealResponse } from "./MealResponse"
+import type { Nutrition } from "./Nutrition"
+
+export type DayResponse = {
+  meals: Array<MealResponse>
+  nutrition: Nutrition
+}
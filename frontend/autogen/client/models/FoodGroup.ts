@@ -0,0 +1,20 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+/**
+ *
+ * Food groups I use to make it easier to shop groceries.
+ *
+ */
+export enum FoodGroup {
+  BREAD = "bread",
+  PANTRY = "pantry",
+  DAIRY = "dairy",
+  FROZEN = "frozen",
+  PRODUCE = "produce",
+  MEAT = "meat",
+  INDIAN = "indian",
+  ASIAN = "asian",
+}
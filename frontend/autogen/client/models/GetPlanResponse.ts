@@ -0,0 +1,21 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { DayResponse } from "./DayResponse"
+import type { GetRecipesResponse } from "./GetRecipesResponse"
+import type { GroceryGroupResponse } from "./GroceryGroupResponse"
+import type { TotalsResponse } from "./TotalsResponse"
+
+/**
+ *
+ * Everything about the week's plan. Fields that were not requested are null.
+ *
+ */
+export type GetPlanResponse = {
+  days?: Array<DayResponse> | null
+  recipes?: Array<GetRecipesResponse> | null
+  totals?: TotalsResponse | null
+  groceries?: Array<GroceryGroupResponse> | null
+}
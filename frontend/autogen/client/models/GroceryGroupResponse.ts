@@ -0,0 +1,12 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { FoodGroup } from "./FoodGroup"
+import type { UntrackedIngredient } from "./UntrackedIngredient"
+
+export type GroceryGroupResponse = {
+  group: FoodGroup
+  items: Array<UntrackedIngredient>
+}
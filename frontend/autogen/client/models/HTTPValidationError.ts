@@ -0,0 +1,10 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { ValidationError } from "./ValidationError"
+
+export type HTTPValidationError = {
+  detail?: Array<ValidationError>
+}
@@ -0,0 +1,11 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { Nutrition } from "./Nutrition"
+
+export type MealResponse = {
+  recipes: Array<string>
+  nutrition: Nutrition
+}
@@ -0,0 +1,20 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+import type { DayResponse } from "./DayResponse"
+import type { GetRecipesResponse } from "./GetRecipesResponse"
+
+/**
+ *
+ * Changes since the previous plan event. Days are keyed by index; day_count
+ * tells the client to drop any days past the end of the week.
+ *
+ */
+export type PlanDelta = {
+  day_count: number
+  days: Record<string, DayResponse>
+  recipes: Array<GetRecipesResponse>
+  removed_recipes: Array<string>
+}
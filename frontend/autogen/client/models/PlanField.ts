@@ -0,0 +1,16 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+/**
+ *
+ * Parts of the weekly plan that can be requested from /api/plan.
+ *
+ */
+export enum PlanField {
+  DAYS = "days",
+  RECIPES = "recipes",
+  TOTALS = "totals",
+  GROCERIES = "groceries",
+}
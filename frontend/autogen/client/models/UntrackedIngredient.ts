@@ -0,0 +1,16 @@
+/* generated using openapi-typescript-codegen -- do no edit */
+/* istanbul ignore file */
+/* tslint:disable */
+/* eslint-disable */
+
+/**
+ *
+ * Untracked means that the ingredients is just for flavor.
+ * That is, I think the calories/nutrients are negligible.
+ *
+ */
+export type UntrackedIngredient = {
+  name: string
+  amount: number
+  unit: string
+}
@@ -6,8 +6,10 @@
 import type { CancelablePromise } from "../core/CancelablePromise"
 import { OpenAPI } from "../core/OpenAPI"
 import { request as __request } from "../core/request"
+import type { GetPlanResponse } from "../models/GetPlanResponse"
 import type { GetRecipesResponse } from "../models/GetRecipesResponse"
 import type { Nutrition } from "../models/Nutrition"
+import type { PlanField } from "../models/PlanField"
 
 export class DefaultService {
   /**
@@ -49,4 +51,25 @@ export class DefaultService {
       url: "/api/recipes",
     })
   }
+
+  /**
+   * Get Plan
+   * @param fields
+   * @returns GetPlanResponse Successful Response
+   * @throws ApiError
+   */
+  public static getPlanApiPlanGet(
+    fields?: Array<PlanField>
+  ): CancelablePromise<GetPlanResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/plan",
+      query: {
+        fields: fields,
+      },
+      errors: {
+        422: `Validation Error`,
+      },
+    })
+  }
 }
@@ -0,0 +1,82 @@
+"use client"
+
+import { useEffect, useState } from "react"
+import {
+  GetRecipesResponse,
+  Nutrition,
+  OpenAPI,
+  PlanDelta,
+} from "@/autogen/client/index"
+import { startCase } from "lodash"
+
+import { DataTable } from "@/components/ui/data-table"
+import { RecipesNutrition, columns } from "@/components/columns"
+
+const day_of_week = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+interface LiveNutritionProps {
+  days: Nutrition[]
+  recipes: GetRecipesResponse[]
+}
+
+export function LiveNutrition({
+  days: initial_days,
+  recipes: initial_recipes,
+}: LiveNutritionProps) {
+  const [days, setDays] = useState(initial_days)
+  const [recipes, setRecipes] = useState(initial_recipes)
+
+  useEffect(() => {
+    // The first event is the whole plan, later ones only what changed.
+    const source = new EventSource(`${OpenAPI.BASE}/api/plan/events`)
+    source.addEventListener("plan", (event) => {
+      const delta: PlanDelta = JSON.parse((event as MessageEvent).data)
+      setDays((days) => {
+        const next = days.slice(0, delta.day_count)
+        for (const [index, day] of Object.entries(delta.days)) {
+          next[Number(index)] = day.nutrition
+        }
+        return next
+      })
+      setRecipes((recipes) => {
+        const changed = new Map(delta.recipes.map((r) => [r.name, r]))
+        const removed = new Set(delta.removed_recipes)
+        const next = recipes
+          .filter((recipe) => !removed.has(recipe.name))
+          .map((recipe) => changed.get(recipe.name) ?? recipe)
+        const names = new Set(next.map((recipe) => recipe.name))
+        return [...next, ...delta.recipes.filter((r) => !names.has(r.name))]
+      })
+    })
+    return () => source.close()
+  }, [])
+
+  const data: RecipesNutrition[] = [
+    ...days.map((nutrition, index) => {
+      return {
+        name: day_of_week[(index + 5) % 7],
+        ...nutrition,
+      }
+    }),
+    ...recipes.map((recipe) => {
+      return {
+        name: startCase(recipe.name),
+        ...recipe.nutrition,
+      }
+    }),
+  ]
+  const total_weekly_calories = days
+    .map((a) => a.calories)
+    .reduce((a, b) => a + b, 0)
+  const average_daily_calories = total_weekly_calories / 7
+
+  return (
+    <>
+      <div className="pb-8">Total weekly calories: {total_weekly_calories}</div>
+      <div className="pb-8">
+        Average daily calories: {average_daily_calories}
+      </div>
+      <DataTable columns={columns} data={data} />
+    </>
+  )
+}